@@ -1,26 +1,164 @@
-import re
 import sys
 
+# Tokenizer states for extract_module_info
+_FIND_MODULE, _SKIP_WS, _READ_IDENT, _SKIP_TO_LPAREN = range(4)
+
+# Translation table that drops whitespace from a port declaration
+_STRIP_WS = str.maketrans('', '', ' \t\r\n')
+
+
+def _is_ident_char(ch):
+    return ch.isalnum() or ch == '_'
+
+def _comment_end(sv_code, i):
+    """
+    Returns the index just past the comment opened by the '/' at i, or -1
+    if no comment starts there. Line comments swallow their trailing newline.
+    """
+    if i + 1 >= len(sv_code):
+        return -1
+    marker = sv_code[i + 1]
+    if marker == '/':
+        end = sv_code.find('\n', i + 2)
+        return len(sv_code) if end == -1 else end + 1
+    if marker == '*':
+        end = sv_code.find('*/', i + 2)
+        return len(sv_code) if end == -1 else end + 2
+    return -1
+
+def _skip_group(sv_code, i):
+    """
+    Returns the index just past the ')' balancing the '(' at i, skipping
+    comments, or the end of the source if the group is never closed.
+    """
+    n = len(sv_code)
+    depth = 0
+    while i < n:
+        ch = sv_code[i]
+        end = _comment_end(sv_code, i) if ch == '/' else -1
+        if end != -1:
+            i = end
+            continue
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if not depth:
+                return i + 1
+        i += 1
+    return n
+
+def _find_port_list(sv_code, start):
+    """
+    Scans the balanced port list opened by the first '(' at or after start.
+    Returns the raw port substrings with comments cut out, or None if the
+    list is not closed by ');' at depth 0.
+    """
+    n = len(sv_code)
+    i = sv_code.find('(', start)
+    if i == -1:
+        return None
+    ports = []
+    pieces = []
+    depth = 0
+    i += 1
+    seg = i
+    while i < n:
+        ch = sv_code[i]
+        end = _comment_end(sv_code, i) if ch == '/' else -1
+        if end != -1:
+            pieces.append(sv_code[seg:i])
+            i = seg = end
+            continue
+        if ch == '(':
+            depth += 1
+        elif ch == ')' and depth:
+            depth -= 1
+        elif ch == ')' or (ch == ',' and not depth):
+            pieces.append(sv_code[seg:i])
+            ports.append(''.join(pieces))
+            pieces = []
+            seg = i + 1
+            if ch == ')':
+                # Stop early: the list must be terminated by ');'
+                while seg < n and sv_code[seg].isspace():
+                    seg += 1
+                return ports if sv_code.startswith(';', seg) else None
+        i += 1
+    return None
+
 def extract_module_info(sv_code):
     module_info = {}
-    module_name_pattern = r"module\s+(\w+)"
-    ports_pattern = r"\((.*?)\);"
-    
-    module_name_match = re.search(module_name_pattern, sv_code)
-    ports_match = re.search(ports_pattern, sv_code, re.DOTALL)
-    
-    if module_name_match and ports_match:
-        module_info['name'] = module_name_match.group(1)
-        ports = ports_match.group(1)
-        # Remove comments from ports declaration
-        ports = re.sub(r'\/\/.*?\n', '', ports)
-        ports = ports.replace("\n", "")
-        ports = ports.replace(" ", "")
-        ports = ports.split(",")
-        
+    n = len(sv_code)
+    state = _FIND_MODULE
+    name = None
+    ports = None
+    saw_sep = False
+    after_hash = False
+    start = 0
+    i = 0
+
+    # Single forward pass over the module header, skipping comments inline
+    while i < n:
+        ch = sv_code[i]
+        end = _comment_end(sv_code, i) if ch == '/' else -1
+        if end != -1:
+            if state == _READ_IDENT:
+                name = sv_code[start:i]
+                state = _SKIP_TO_LPAREN
+            elif state == _SKIP_WS:
+                saw_sep = True
+            i = end
+            continue
+
+        if state == _FIND_MODULE:
+            if _is_ident_char(ch):
+                j = i + 1
+                while j < n and _is_ident_char(sv_code[j]):
+                    j += 1
+                if sv_code[i:j] == 'module':
+                    state = _SKIP_WS
+                    saw_sep = False
+                i = j
+            else:
+                i += 1
+        elif state == _SKIP_WS:
+            if ch.isspace():
+                saw_sep = True
+                i += 1
+            elif _is_ident_char(ch) and saw_sep:
+                state = _READ_IDENT
+                start = i
+            else:
+                state = _FIND_MODULE
+        elif state == _READ_IDENT:
+            if _is_ident_char(ch):
+                i += 1
+            else:
+                name = sv_code[start:i]
+                state = _SKIP_TO_LPAREN
+        else:  # _SKIP_TO_LPAREN
+            if ch == '(' and after_hash:
+                # Parameter list of a '#(...)' header, not the ports
+                after_hash = False
+                i = _skip_group(sv_code, i)
+                continue
+            if ch == '(':
+                ports = _find_port_list(sv_code, i)
+                break
+            if ch == ';':
+                break
+            if ch == '#':
+                after_hash = True
+            elif not ch.isspace():
+                after_hash = False
+            i += 1
+
+    if name and ports is not None:
+        module_info['name'] = name
         module_info['ports'] = []
         for port in ports:
-            port_parts = port.split(":")
+            port_parts = port.translate(_STRIP_WS).split(":")
             if len(port_parts) == 2:
                 port_info = port_parts[1].split()
                 direction = port_parts[0]
@@ -2,7 +2,7 @@ def generate_assertions(design):
     """
     Generates assertions for the design.
     """
+    lines = ["// Assertions"]
+    lines.extend(f"assert ({param} == expected_value) else $fatal(\"{param} assertion failed\");" for param in design['parameters'])
     with open('assertions.sv', 'w') as file:
-        file.write("// Assertions\n")
-        for param in design['parameters']:
-            file.write(f"assert ({param} == expected_value) else $fatal(\"{param} assertion failed\");\n")
+        file.write("\n".join(lines) + "\n")
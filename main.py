@@ -23,11 +23,28 @@
 #       parameters.
 
 
+import functools
+import hashlib
+import json
+import mmap
 import os
-import re
+
+try:
+    # Linear-time engine, immune to catastrophic backtracking
+    import re2 as re
+except ImportError:
+    import re
+
+# Debug output (file content and parsed items) is enabled by setting
+# SVGEN_DEBUG to any value other than empty or 0
+DEBUG = os.environ.get('SVGEN_DEBUG', '').strip() not in ('', '0')
+
+# The on-disk design cache is bypassed when SVGEN_NO_CACHE is set the same way,
+# and always while debugging so the parse output is printed on every run
+NO_CACHE = DEBUG or os.environ.get('SVGEN_NO_CACHE', '').strip() not in ('', '0')
 
 # Set of reserved keywords in System Verilog
-RESERVED_KEYWORDS = {
+RESERVED_KEYWORDS = frozenset({
     "always", "and", "assign", "automatic", "begin", "buf", "bufif0", "bufif1", "case", "casex", "casez", "cmos",
     "deassign", "default", "defparam", "disable", "edge", "else", "end", "endcase", "endfunction", "endgenerate",
     "endmodule", "endprimitive", "endspecify", "endtable", "endtask", "event", "for", "force", "forever", "fork",
@@ -38,7 +55,37 @@ RESERVED_KEYWORDS = {
     "specify", "specparam", "strong0", "strong1", "supply0", "supply1", "table", "task", "time", "tran", 
     "tranif0", "tranif1", "tri", "tri0", "tri1", "triand", "trior", "trireg", "unsigned", "vectored", "wait", 
     "wand", "weak0", "weak1", "while", "wire", "wor", "xnor", "xor"
-}
+})
+
+# Signal directions driven by the testbench (declared as reg)
+_WRITABLE = frozenset(('input', 'inout'))
+
+# Pre-compiled pattern matching modules, signals, and parameters in one pass.
+# Flags are inline since re2.compile takes no flags argument.
+_ITEM_RE = re.compile(
+    r'(?i)(?P<mod>\bmodule\s+(?P<mod_name>\w+)\s*\()'
+    r'|(?P<sig>\b(?P<sig_type>input|output|inout)\s+(?:(?:wire|reg|logic)\b\s*)?(?:(?P<sig_width>\[[^\]]*\])\s*)?(?P<sig_name>\w+))'
+    r'|(?P<par>\bparameter\s+(?P<par_name>\w+)\s*=\s*(?P<par_value>[\w\'\[\]:]+);)'
+)
+
+# Byte-string variant, run directly over a memory-mapped file
+_ITEM_RE_B = re.compile(_ITEM_RE.pattern.encode('ascii'))
+
+# Group numbers of _ITEM_RE; matches are dispatched on lastindex, the number
+# of the outermost alternative that matched
+_MOD, _MOD_NAME, _SIG, _SIG_TYPE, _SIG_WIDTH, _SIG_NAME, _PAR, _PAR_NAME, _PAR_VALUE = (
+    _ITEM_RE.groupindex[name] for name in (
+        'mod', 'mod_name', 'sig', 'sig_type', 'sig_width', 'sig_name', 'par', 'par_name', 'par_value'
+    )
+)
+
+# Byte order marks recognised at the start of a source file
+_UTF16_BOMS = (b'\xff\xfe', b'\xfe\xff')
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+# Version of the cached design layout; bump when the shape of the design
+# dictionary changes. Parser changes are picked up by _parser_version.
+_CACHE_SCHEMA = 1
 
 
 def sanitize_signal_name(signal_name):
@@ -50,6 +97,48 @@ def sanitize_signal_name(signal_name):
         return signal_name + "_sig"
     return signal_name
 
+def _collect_items(matches, decode):
+    """
+    Sorts matches of _ITEM_RE or _ITEM_RE_B into modules, signals, and parameters.
+    decode turns a captured group (possibly None) into a str. Signals named
+    after a reserved keyword are dropped as they are collected.
+    Signals are returned as parallel 'type', 'width', and 'name' lists.
+    """
+    modules, parameters = [], []
+    signals = {'type': [], 'width': [], 'name': []}
+    types, widths, names = signals['type'], signals['width'], signals['name']
+    for match in matches:
+        kind = match.lastindex
+        if kind == _MOD:
+            modules.append(decode(match.group(_MOD_NAME)))
+        elif kind == _SIG:
+            signal_name = decode(match.group(_SIG_NAME))
+            if signal_name not in RESERVED_KEYWORDS:
+                types.append(decode(match.group(_SIG_TYPE)))
+                widths.append(decode(match.group(_SIG_WIDTH)))
+                names.append(signal_name)
+        elif kind == _PAR:
+            parameters.append((decode(match.group(_PAR_NAME)), decode(match.group(_PAR_VALUE))))
+    return modules, signals, parameters
+
+def _sniff_encoding(head):
+    """
+    Returns the encoding named by the byte order mark at the start of head,
+    defaulting to UTF-8 when there is none.
+    """
+    if head[:2] in _UTF16_BOMS:
+        return 'utf-16'
+    if head[:3] == _UTF8_BOM:
+        return 'utf-8-sig'
+    return 'utf-8'
+
+def _decode_text(group):
+    return group or ''
+
+def _decode_bytes(group):
+    # Widths may span any bytes (comments, non-ASCII text), so never fail here
+    return group.decode('utf-8', errors='replace') if group else ''
+
 def parse_system_verilog(filepath):
     """
     Parses a System Verilog file and returns a representation of the design.
@@ -60,64 +149,210 @@ def parse_system_verilog(filepath):
     """
     design = {
         'modules': [],
-        'signals': [],
+        'signals': {'type': [], 'width': [], 'name': []},
         'parameters': []
     }
-    # Read the file content
+    # Map the file and parse it in place; only UTF-16 sources are decoded
     try:
-        with open(filepath, 'r', encoding='utf-16') as file:
-            content = file.read()
-    except UnicodeError:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            content = file.read()
+        fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
     except FileNotFoundError:
         print(f"Error: File not found at {filepath}")
         return design
     except Exception as e:
         print(f"Error reading file: {e}")
         return design
+    try:
+        if os.fstat(fd).st_size == 0:
+            return design
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return design
+    finally:
+        # The mapping keeps its own handle on the file
+        os.close(fd)
+
+    with mm:
+        encoding = _sniff_encoding(mm[:3])
+        if encoding == 'utf-16':
+            content = mm[:].decode(encoding, errors='replace')
 
-    # Debug: Print the file content
-    print(f"File content:\n{content}\n")
+            # Debug: Print the file content
+            if DEBUG:
+                print(f"File content:\n{content}\n")
 
-    # Enhanced regex-based parsing for modules, signals, and parameters
-    modules = re.findall(r'\bmodule\s+(\w+)\s*\(', content, re.IGNORECASE)
-    signals = re.findall(r'\b(input|output|inout)\s+(?:wire|reg|logic)?\s*(\[.*?\])?\s*(\w+)', content, re.IGNORECASE)
-    parameters = re.findall(r'\bparameter\s+(\w+)\s*=\s*([\w\'\[\]:]+);', content, re.IGNORECASE)
+            modules, signals, parameters = _collect_items(_ITEM_RE.finditer(content), _decode_text)
+        else:
+            # Debug: Print the file content
+            if DEBUG:
+                print(f"File content:\n{mm[:].decode(encoding, errors='replace')}\n")
+
+            # The UTF-8 BOM is not a word character, so it cannot affect matches.
+            # Matches are listed first so the scanner releases its export of the
+            # mapping before anything else can raise and the mapping is closed
+            matches = list(_ITEM_RE_B.finditer(mm))
+            modules, signals, parameters = _collect_items(matches, _decode_bytes)
 
     # Debug: Print parsed items
-    print(f"Parsed modules: {modules}")
-    print(f"Parsed signals: {signals}")
-    print(f"Parsed parameters: {parameters}")
+    if DEBUG:
+        print(f"Parsed modules: {modules}")
+        print(f"Parsed signals: {signals}")
+        print(f"Parsed parameters: {parameters}")
 
     design['modules'] = modules
-    design['signals'] = [(s[0], s[1], sanitize_signal_name(s[2])) for s in signals if s[2] not in RESERVED_KEYWORDS]  # Filter out invalid signals
+    # Reserved names were filtered out in _collect_items, so the remaining
+    # names never need sanitize_signal_name
+    design['signals'] = signals
     design['parameters'] = [(p[0], p[1]) for p in parameters]  # Store parameter names and values
 
     return design
 
+def _cache_dir():
+    """
+    Returns the per-user directory holding cached designs, creating it with
+    mode 0o700, or None if it cannot be used safely.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    cache_dir = os.path.join(base, 'svgen')
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        st = os.lstat(cache_dir)
+    except OSError:
+        return None
+    # Refuse a directory (or symlink) that another user could write to
+    if not os.path.isdir(cache_dir) or os.path.islink(cache_dir):
+        return None
+    if hasattr(os, 'getuid') and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        return None
+    return cache_dir
+
+@functools.lru_cache(maxsize=None)
+def _parser_version():
+    """
+    Returns a short digest identifying the parser that produced a cached
+    design: the cache schema, the regex engine, the item pattern, and the
+    source of this module.
+    """
+    digest = hashlib.blake2b(f"{_CACHE_SCHEMA}|{re.__name__}|{_ITEM_RE.pattern}".encode('utf-8'))
+    try:
+        with open(__file__, 'rb') as file:
+            digest.update(file.read())
+    except OSError:
+        pass
+    return digest.hexdigest()[:16]
+
+def _design_from_json(data):
+    """
+    Rebuilds a design dictionary from its JSON form, raising ValueError if the
+    data does not have the expected shape.
+    """
+    modules = data['modules']
+    columns = [data['signals'][key] for key in ('type', 'width', 'name')]
+    parameters = [tuple(p) for p in data['parameters']]
+    if not all(isinstance(item, str) for item in modules):
+        raise ValueError("bad modules")
+    if len({len(column) for column in columns}) != 1 or not all(
+            isinstance(item, str) for column in columns for item in column):
+        raise ValueError("bad signals")
+    if not all(len(p) == 2 and isinstance(p[0], str) and isinstance(p[1], str) for p in parameters):
+        raise ValueError("bad parameters")
+    return {
+        'modules': list(modules),
+        'signals': dict(zip(('type', 'width', 'name'), (list(column) for column in columns))),
+        'parameters': parameters
+    }
+
+def parse_system_verilog_cached(filepath):
+    """
+    Parses a System Verilog file like parse_system_verilog, reusing the design
+    cached in the per-user cache directory when the file is unchanged since
+    it was last parsed.
+    Parameters:
+    filepath (str): The path to the System Verilog file.
+    Returns:
+    dict: A dictionary representation of the design containing modules, signals, and parameters.
+    """
+    if NO_CACHE:
+        return parse_system_verilog(filepath)
+    try:
+        abs_path = os.path.abspath(filepath)
+        st = os.stat(abs_path)
+    except OSError:
+        # Let parse_system_verilog report the problem
+        return parse_system_verilog(filepath)
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return parse_system_verilog(filepath)
+
+    # Keyed by path, modification time, size, and parser version so edits to
+    # the design or to the parser invalidate the entry
+    path_hash = hashlib.blake2b(os.fsencode(abs_path)).hexdigest()[:16]
+    cache_name = f"{path_hash}-{st.st_mtime_ns}-{st.st_size}-{_parser_version()}.json"
+    cache_path = os.path.join(cache_dir, cache_name)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            return _design_from_json(json.load(file))
+    except Exception:
+        pass
+
+    design = parse_system_verilog(filepath)
+    if design['modules']:
+        # Write to a new private file first so readers never see a partial entry
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+        except OSError:
+            return design
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(design, file)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return design
+
+        # Drop entries left behind by earlier versions of the same file
+        try:
+            names = os.listdir(cache_dir)
+        except OSError:
+            names = []
+        for name in names:
+            if name.startswith(f"{path_hash}-") and name.endswith('.json') and name != cache_name:
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
+    return design
+
 
 def generate_test_vectors(signals):
     """
     Generates test vectors for the design.
    
     Parameters:
-    - signals: List of tuples representing the signals in the design.
+    - signals: Dictionary of parallel 'type', 'width', and 'name' lists for the signals in the design.
     Returns:
     - A list of strings representing the test vectors for the testbench.
     """
+    # One pass collects both the initial values and the clock generators
+    init_lines = []
+    clk_lines = []
+    for signal_type, signal_name in zip(signals['type'], signals['name']):
+        if signal_type in _WRITABLE:
+            init_lines.append(f"    {signal_name} = 0;")
+            if 'clk' in signal_name.lower():
+                clk_lines.append(f"    forever #5 {signal_name} = ~{signal_name};")
     test_vectors = ["  initial begin"]
     test_vectors.append("    // Initialize inputs and apply test vectors")
-    for signal_type, signal_width, signal_name in signals:
-        if signal_type in ['input', 'inout']:
-            test_vectors.append(f"    {signal_name} = 0;")
+    test_vectors.extend(init_lines)
     test_vectors.append("    // Apply test vectors")
     test_vectors.append("    #10;")
     test_vectors.append("    res_n = 1;")
     test_vectors.append("    #10;")
-    for signal_type, signal_width, signal_name in signals:
-        if signal_type in ['input', 'inout'] and 'clk' in signal_name.lower():
-            test_vectors.append(f"    forever #5 {signal_name} = ~{signal_name};")
+    test_vectors.extend(clk_lines)
     test_vectors.append("  end")
     return test_vectors
 
@@ -125,20 +360,18 @@ def monitor_output(signals):
     """
     Monitors the output of the design under test.
     Parameters:
-    - signals: List of tuples representing the signals in the design.
+    - signals: Dictionary of parallel 'type', 'width', and 'name' lists for the signals in the design.
     Returns:
     - A list of strings representing the monitor code for the testbench.
     """
-    monitor_code = ["  initial begin"]
-    monitor_code.append("    $monitor(\"At time %0t:")
-    for signal_type, signal_width, signal_name in signals:
-        monitor_code.append(f" {signal_name} = %b,")
-    monitor_code[-1] = monitor_code[-1].rstrip(",")  # Remove trailing comma
-    monitor_code.append("\", $time")
-    for signal_type, signal_width, signal_name in signals:
-        monitor_code.append(f", {signal_name}")
-    monitor_code.append(");")
-    monitor_code.append("  end")
+    names = signals['name']
+    sig_fmt = ", ".join(f"{signal_name} = %b" for signal_name in names)
+    sig_args = "".join(f", {signal_name}" for signal_name in names)
+    monitor_code = [
+        "  initial begin",
+        f"    $monitor(\"At time %0t: {sig_fmt}\", $time{sig_args});",
+        "  end"
+    ]
     return monitor_code
 
 def setup_simulation(modules, signals, test_vectors, monitor):
@@ -146,48 +379,69 @@ def setup_simulation(modules, signals, test_vectors, monitor):
     Sets up the simulation environment.
     Parameters:
     - modules: List of module names in the design.
-    - signals: List of tuples representing the signals in the design.
+    - signals: Dictionary of parallel 'type', 'width', and 'name' lists for the signals in the design.
     - test_vectors: List of strings representing the test vectors for the testbench.
     - monitor: List of strings representing the monitor code for the testbench.
     Returns:
     - A list of strings representing the complete testbench code.
     """
-    simulation_code = ["`timescale 1ns / 1ps\n"]
+    # Resolve every per-signal branch once; each module then only substitutes
+    # its name into the pre-built blocks. Every block line carries its own
+    # leading newline so an empty block leaves no blank line behind.
+    names = signals['name']
+    declarations = []
+    for signal_type, signal_width, signal_name in zip(signals['type'], signals['width'], names):
+        signal_type_decl = 'reg' if signal_type in _WRITABLE else 'wire'
+        if signal_width:
+            declarations.append(f"\n  {signal_type_decl} {signal_width} {signal_name};")
+        else:
+            declarations.append(f"\n  {signal_type_decl} {signal_name};")
+    decl_block = "".join(declarations)
+    inst_block = ",".join(f"\n    .{signal_name}({signal_name})" for signal_name in names)
+    test_block = "".join(f"\n{line}" for line in test_vectors)
+    monitor_block = "".join(f"\n{line}" for line in monitor)
+
+    # Elements carry no trailing newline; save_testbench joins them with "\n"
+    simulation_code = ["`timescale 1ns / 1ps"]
     for module in modules:
-        simulation_code.append(f"module {module}_tb;\n")
-        simulation_code.append("  // Declare variables for the inputs and outputs of the DUT (Device Under Test)\n")
-        for signal_type, signal_width, signal_name in signals:
-            signal_type_decl = 'reg' if signal_type in ['input', 'inout'] else 'wire'
-            if signal_width:
-                signal_declaration = f"{signal_type_decl} {signal_width} {signal_name};"
-            else:
-                signal_declaration = f"{signal_type_decl} {signal_name};"
-            simulation_code.append(f"  {signal_declaration}\n")
-        simulation_code.append("\n  // Instantiate the DUT\n")
-        simulation_code.append(f"  {module} uut (\n")
-        for signal_type, signal_width, signal_name in signals:
-            simulation_code.append(f"    .{signal_name}({signal_name}),\n")
-        simulation_code[-1] = simulation_code[-1].rstrip(",\n") + "\n  );\n"
-        simulation_code.append("\n  // Test vectors\n")
-        simulation_code.extend(test_vectors)
-        simulation_code.append("\n  // Monitor changes\n")
-        simulation_code.extend(monitor)
-        simulation_code.append("  initial begin\n    #200 $finish;\n  end\n")  # Stop simulation after 200 time units
-        simulation_code.append("endmodule\n")
+        # The last initial block stops the simulation after 200 time units
+        simulation_code.append("")
+        simulation_code.append(f"""module {module}_tb;
+
+  // Declare variables for the inputs and outputs of the DUT (Device Under Test){decl_block}
+
+  // Instantiate the DUT
+  {module} uut ({inst_block}
+  );
+
+  // Test vectors{test_block}
+
+  // Monitor changes{monitor_block}
+  initial begin
+    #200 $finish;
+  end
+
+endmodule""")
     return simulation_code
 
-def save_testbench(output_dir, simulation_code):
+def save_testbench(tb_path, simulation_code):
     """
     Saves the generated testbench to a file.
     Parameters:
-    output_dir (str): The directory to save the testbench file.
+    tb_path (str): The path of the testbench file to write.
     simulation_code (list): List of strings representing the simulation setup code.
     Returns:
     str: The path to the saved testbench file.
     """
-    tb_path = os.path.join(output_dir, 'generated_testbench.sv')
-    with open(tb_path, 'w') as file:
-        file.writelines("\n".join(simulation_code))  # Join with newline for better formatting
+    # Encode once and write the raw bytes, skipping the text-mode codec layer
+    data = ("\n".join(simulation_code) + "\n").encode('utf-8')
+    fd = os.open(tb_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
     return tb_path
 
 def analyze_results():
@@ -207,10 +461,10 @@ def main():
     Main function to generate the testbench for the System Verilog design.
     """
     filepath = r'C:\Users\mutth\study\Final Project\system_verilog_testbench_generator\file.sv'
-    output_dir = os.path.dirname(filepath)
+    tb_path = os.path.join(os.path.dirname(filepath), 'generated_testbench.sv')
 
     # Parse System Verilog files
-    design = parse_system_verilog(filepath)
+    design = parse_system_verilog_cached(filepath)
 
     # Check if design parsing was successful
     if not design['modules']:
@@ -227,7 +481,7 @@ def main():
     simulation_code = setup_simulation(design['modules'], design['signals'], test_vectors, monitor)
 
     # Save the generated testbench
-    tb_path = save_testbench(output_dir, simulation_code)
+    save_testbench(tb_path, simulation_code)
     print(f"Testbench generated and saved to: {tb_path}")
 
     # Execute simulation and analyze results
@@ -2,8 +2,9 @@ def monitor_output(design):
     """
     Monitors the output of the design under test.
     """
+    lines = ["// Output Monitor"]
+    for signal in design['signals']:
+        if signal[0] == 'output':
+            lines.append(f"initial begin\n  $monitor(\"%b\", {signal[1]});\nend")
     with open('output_monitor.sv', 'w') as file:
-        file.write("// Output Monitor\n")
-        for signal in design['signals']:
-            if signal[0] == 'output':
-                file.write(f"initial begin\n  $monitor(\"%b\", {signal[1]});\nend\n")
+        file.write("\n".join(lines) + "\n")
@@ -2,12 +2,12 @@ def setup_simulation(design):
     """
     Sets up the simulation environment.
     """
+    lines = ["// Simulation Setup", "`timescale 1ns/1ps"]
+    for module in design['modules']:
+        lines.append(f"module tb_{module};")
+        lines.append("  // DUT instantiation")
+        lines.append(f"  {module} dut ();")
+        lines.append("  // Add stimulus and monitor")
+        lines.append("endmodule")
     with open('simulation_setup.sv', 'w') as file:
-        file.write("// Simulation Setup\n")
-        file.write("`timescale 1ns/1ps\n")
-        for module in design['modules']:
-            file.write(f"module tb_{module};\n")
-            file.write("  // DUT instantiation\n")
-            file.write(f"  {module} dut ();\n")
-            file.write("  // Add stimulus and monitor\n")
-            file.write("endmodule\n")
+        file.write("\n".join(lines) + "\n")
@@ -1,4 +1,12 @@
-import re
+try:
+    import re2 as re
+except ImportError:
+    import re
+
+# Pre-compiled patterns for parsing modules, signals, and parameters
+_MODULE_RE = re.compile(r'\bmodule\s+(\w+)')
+_SIGNAL_RE = re.compile(r'\b(input|output|inout|wire|reg)\s+\w+\s+(\w+)')
+_PARAM_RE = re.compile(r'\bparameter\s+\w+\s+(\w+)')
 
 def parse_system_verilog(filepath):
     """
@@ -14,9 +22,9 @@ def parse_system_verilog(filepath):
         content = file.read()
 
     # Simple regex-based parsing for modules, signals, and parameters
-    modules = re.findall(r'\bmodule\s+(\w+)', content)
-    signals = re.findall(r'\b(input|output|inout|wire|reg)\s+\w+\s+(\w+)', content)
-    parameters = re.findall(r'\bparameter\s+\w+\s+(\w+)', content)
+    modules = _MODULE_RE.findall(content)
+    signals = _SIGNAL_RE.findall(content)
+    parameters = _PARAM_RE.findall(content)
 
     design['modules'] = modules
     design['signals'] = signals
@@ -0,0 +1,37 @@
+import pytest
+
+from analysis import extract_module_info
+
+
+# (source, expected module name, expected ports); name None means {} is expected
+HEADERS = [
+    ("module foo (input:a, output:b);", "foo",
+     [("input", "logic", "a"), ("output", "logic", "b")]),
+    ("module foo (\n  input: a, // trailing, comment\n  output: b\n);", "foo",
+     [("input", "logic", "a"), ("output", "logic", "b")]),
+    ("module foo (input:a, output: b /* x, y */ );", "foo",
+     [("input", "logic", "a"), ("output", "logic", "b")]),
+    ("module foo/*x*/(input:a);", "foo", [("input", "logic", "a")]),
+    ("module /*x*/foo (input:a);", "foo", [("input", "logic", "a")]),
+    ("module // x\nfoo (input:a);", "foo", [("input", "logic", "a")]),
+    ("// module bar (input:z);\nmodule foo (input:a);", "foo", [("input", "logic", "a")]),
+    ("module foo (input:a) ;", "foo", [("input", "logic", "a")]),
+    ("module foo (input:a, output:f(b, c));", "foo",
+     [("input", "logic", "a"), ("output", "logic", "f(b,c)")]),
+    ("module foo #(parameter W=8) (input:a, output:b);", "foo",
+     [("input", "logic", "a"), ("output", "logic", "b")]),
+    ("module foo # ( parameter W=(8) /* ) */ ) (input:a);", "foo", [("input", "logic", "a")]),
+    ("module foo ();", "foo", []),
+    ("module foo (input:a) x", None, None),
+    ("submodule foo (input:a);", None, None),
+    ("module foo (input:a", None, None),
+]
+
+
+@pytest.mark.parametrize("sv_code, name, ports", HEADERS)
+def test_extract_module_info(sv_code, name, ports):
+    module_info = extract_module_info(sv_code)
+    if name is None:
+        assert module_info == {}
+    else:
+        assert module_info == {'name': name, 'ports': ports}